@@ -1,15 +1,25 @@
 # app.py
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
 
+# 작업 스레드에서 st.cache_data를 쓰기 위한 ScriptRunContext 연결 함수
+# - Streamlit 공개 API가 아니므로 버전에 따라 위치가 바뀔 수 있음
+#   → import에 실패하면 session_memo_many는 순차 실행으로 동작
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
 from recall_repo import (
     fetch_recalls,
     fetch_makers,
     fetch_year_range,
-    fetch_kpi,
-    fetch_maker_ranking,
+    fetch_stats,
     fetch_year_trend,
-    fetch_model_ranking,
 )
 
 # =========================
@@ -32,7 +42,13 @@ st.title("자동차 리콜 현황")
 # =========================
 # 1) 공통 옵션 로딩 (캐시)
 # =========================
-@st.cache_data(show_spinner=False)
+# 판단 근거:
+# - 위젯 조작마다 스크립트 전체가 재실행되므로, 동일 필터 조합의 DB 조회는 캐시로 재사용
+# - ttl을 두어 DB에 적재된 신규 데이터가 일정 주기로 화면에 반영되도록 함
+CACHE_TTL = 300
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def cached_makers(scope: str):
     """
     제조사 드롭다운 옵션을 캐시하여 반환한다.
@@ -46,7 +62,7 @@ def cached_makers(scope: str):
     return ["전체"] + fetch_makers(scope)
 
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def cached_years():
     """
     제조연도 선택 옵션(최소~최대 연도)을 캐시하여 반환한다.
@@ -58,11 +74,161 @@ def cached_years():
     return list(range(min_y, max_y + 1))
 
 
+# =========================
+# 1-1) 조회/통계 결과 캐시
+# =========================
+# 판단 근거:
+# - 결과와 함께 조회 시각(time.monotonic())을 캐시에 넣어 반환:
+#   세션 메모(1-2)가 저장 시각이 아닌 실제 조회 시각으로 만료를 판단하도록 함
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_recalls(scope: str, maker: str, manufacture_year, search_text: str, limit: int, after=None):
+    """
+    리콜 목록 조회 결과(한 페이지)를 필터 조합/커서별로 캐시하여 반환한다.
+
+    Returns
+    - (loaded_at, DataFrame)
+    """
+    return time.monotonic(), fetch_recalls(
+        scope=scope,
+        maker=maker,
+        manufacture_year=manufacture_year,
+        search_text=search_text,
+        limit=limit,
+        after=after,
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_stats(scope: str, maker: str, year, top_n: int):
+    """
+    통계 탭의 KPI/제조사 랭킹/모델 랭킹을 필터 조합별로 캐시하여 반환한다.
+
+    Returns
+    - (loaded_at, ((recall_cnt, total_units), maker_rows, model_rows))
+    """
+    return time.monotonic(), fetch_stats(scope, maker, year, top_n=top_n)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_year_trend(scope: str, maker: str, min_year: int, max_year: int):
+    """
+    연도별 리콜 추이를 필터 조합별로 캐시하여 반환한다.
+
+    Returns
+    - (loaded_at, [(year, recall_cnt), ...])
+    """
+    return time.monotonic(), fetch_year_trend(scope, maker, min_year, max_year)
+
+
+# =========================
+# 1-2) 세션 단위 메모이제이션
+# =========================
+SESSION_MEMO_SIZE = 16
+
+_MISS = object()
+
+
+def _memo_get(key: tuple):
+    """
+    세션 메모에서 key의 (loaded_at, value)를 꺼낸다. 없거나 조회 후 CACHE_TTL이 지났으면 _MISS를 반환한다.
+    """
+    memo = st.session_state.setdefault("_query_memo", OrderedDict())
+    hit = memo.get(key)
+    if hit is None or time.monotonic() - hit[0] >= CACHE_TTL:
+        return _MISS
+    memo.move_to_end(key)
+    return hit
+
+
+def _memo_put(key: tuple, loaded_at: float, value):
+    """
+    세션 메모에 값을 조회 시각과 함께 저장하고, SESSION_MEMO_SIZE를 넘으면 가장 오래 사용하지 않은 항목부터 제거한다.
+    """
+    memo = st.session_state.setdefault("_query_memo", OrderedDict())
+    memo[key] = (loaded_at, value)
+    memo.move_to_end(key)
+    while len(memo) > SESSION_MEMO_SIZE:
+        memo.popitem(last=False)
+
+
+def session_memo(key: tuple, loader):
+    """
+    동일 필터 조합의 조회 결과를 세션 상태에 보관하고, 같은 객체를 그대로 반환한다.
+
+    Args
+    - key: ("recalls", scope, maker, ...) 형태의 필터 조합 키
+    - loader: 캐시 미스 시 호출할 조회 함수(인자 없음), cached_* 처럼 (loaded_at, value)를 반환
+
+    Returns
+    - (loaded_at, value): 이어 붙인 결과를 _memo_put으로 교체할 때 조회 시각을 함께 넘길 수 있도록 반환
+
+    판단 근거
+    - st.cache_data는 호출마다 결과를 역직렬화(복사)해서 반환:
+      rerun마다 리콜 목록 DataFrame을 다시 복사하지 않도록 세션 안에서는 같은 객체를 재사용
+    - 결과는 읽기 전용으로만 사용하므로 객체 공유가 안전
+    - 최근 사용 순서(LRU)로 SESSION_MEMO_SIZE개까지만 보관하여 세션 메모리 증가를 제한
+    - 만료는 메모에 넣은 시각이 아니라 실제 조회 시각(loaded_at) 기준:
+      st.cache_data에서 꺼낸 결과가 이미 오래됐을 수 있으므로, 저장 시각 기준이면 최대 2×CACHE_TTL까지
+      오래된 데이터가 보일 수 있음 → 조회 후 CACHE_TTL이 지나면 다시 조회(st.cache_data와 같은 주기)
+    """
+    hit = _memo_get(key)
+    if hit is _MISS:
+        hit = loader()
+        _memo_put(key, *hit)
+    return hit
+
+
+def session_memo_many(jobs):
+    """
+    여러 조회를 session_memo와 같은 방식으로 처리하되, 캐시 미스인 조회는 스레드로 동시에 실행한다.
+
+    Args
+    - jobs: [(key, loader), ...]
+
+    Returns
+    - jobs 순서대로의 결과(value) 리스트
+
+    판단 근거
+    - 통계 탭의 조회들은 서로 독립적이고 대부분 DB 응답 대기(I/O):
+      순차 실행 시 합계만큼, 동시 실행 시 가장 느린 조회만큼만 기다림(연결은 커넥션 풀에서 각각 획득)
+    - 세션 상태(LRU) 조회/저장은 메인 스레드에서만 수행하여 동시 수정 방지
+    - 작업 스레드에 ScriptRunContext를 연결해 st.cache_data가 현재 세션에서와 동일하게 동작하도록 함
+      (Streamlit 내부 API 사용, 없으면 순차 실행)
+    - 세션당 동시에 최대 len(jobs)개의 DB 연결을 사용: recall_repo.POOL_SIZE가 부족하면
+      풀 반납을 기다리므로(오류 없음) 동시 사용자 수에 맞춰 POOL_SIZE를 조정
+    """
+    hits = [_memo_get(key) for key, _ in jobs]
+    misses = [i for i, hit in enumerate(hits) if hit is _MISS]
+
+    if misses and (add_script_run_ctx is None or len(misses) == 1):
+        for i in misses:
+            hits[i] = jobs[i][1]()
+            _memo_put(jobs[i][0], *hits[i])
+    elif misses:
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+                max_workers=len(misses),
+                initializer=add_script_run_ctx,
+                initargs=(None, ctx),
+        ) as executor:
+            futures = {i: executor.submit(jobs[i][1]) for i in misses}
+
+        for i, future in futures.items():
+            hits[i] = future.result()
+            _memo_put(jobs[i][0], *hits[i])
+
+    return [hit[1] for hit in hits]
+
+
 # =========================
 # 2) UI 공통 상수
 # =========================
 scopes = ["전체", "국내", "해외"]
+# 리콜 목록 한 페이지(더 보기 1회)에 조회할 행 수
+PAGE_SIZE = 50
 years = cached_years()
+# 연도 선택 옵션: 탭마다 리스트를 새로 만들지 않고 한 번 만든 튜플을 공유
+YEAR_OPTIONS = ("전체", *years)
 
 # 탭 구성: 기능을 "조회"와 "요약/인사이트"로 분리
 tab_list, tab_stats = st.tabs(["리콜 목록", "통계"])
@@ -88,8 +254,7 @@ with tab_list:
         maker_value = st.selectbox("제작사", maker_options, index=0)
 
     with r2[1]:
-        year_options = ["전체"] + years
-        manufacture_year_ui = st.selectbox("제조 연도", year_options, index=0)
+        manufacture_year_ui = st.selectbox("제조 연도", YEAR_OPTIONS, index=0)
 
     with r2[2]:
         search_text = st.text_input(
@@ -100,61 +265,107 @@ with tab_list:
     # UI 선택값 → DB 파라미터 변환
     # 판단 근거:
     # - UI의 "전체"는 '필터 미적용' 의미이므로 None으로 매핑
-    manufacture_year_param = None if manufacture_year_ui == "전체" else int(manufacture_year_ui)
+    # - YEAR_OPTIONS의 연도 값은 이미 int이므로 추가 변환 없이 사용
+    manufacture_year_param = None if manufacture_year_ui == "전체" else manufacture_year_ui
 
     # 데이터 조회
     # 판단 근거:
-    # - limit으로 과도한 카드 렌더링 방지(UX/성능 안정화)
-    try:
-        recalls = fetch_recalls(
+    # - PAGE_SIZE 단위로 조회하고 "더 보기" 시 다음 페이지를 이어 붙임(UX/성능 안정화)
+    # - 지금까지 이어 붙인 목록 전체를 필터 조합당 세션 메모 항목 하나로 보관:
+    #   페이지마다 항목을 만들면 LRU(SESSION_MEMO_SIZE)에서 서로 밀어내고 rerun마다 pd.concat이 반복됨
+    # - 다음 페이지 커서는 목록 마지막 행의 (end_date, recall_id)
+    # - 필터가 바뀌거나 CACHE_TTL이 지나 메모가 만료되면 첫 페이지부터 다시 조회
+    recall_key = ("recalls", scope_value, maker_value, manufacture_year_param, search_text, PAGE_SIZE)
+
+    def load_recall_page(after=None):
+        """
+        현재 필터로 리콜 목록 한 페이지를 조회하여 (loaded_at, (page, has_more))로 반환한다.
+        - has_more: 다음 페이지가 있을 수 있는지 여부
+        """
+        loaded_at, page = cached_recalls(
             scope=scope_value,
             maker=maker_value,
             manufacture_year=manufacture_year_param,
             search_text=search_text,
-            limit=500,
+            limit=PAGE_SIZE,
+            after=after,
         )
+        # 페이지가 가득 찼으면 다음 페이지가 있을 수 있음
+        return loaded_at, (page, len(page) == PAGE_SIZE)
+
+    try:
+        recall_loaded_at, (recalls, has_more) = session_memo(recall_key, load_recall_page)
     except Exception as e:
         st.error(str(e))
         st.stop()
 
     st.divider()
-    st.subheader("리콜 목록 (최근순 카드형)")
-    st.caption(f"총 {len(recalls):,}건 (최대 500건 표시)")
+    st.subheader("리콜 목록 (최근순)")
+    st.caption(f"{len(recalls):,}건 표시" + (" (더 보기로 이어서 조회)" if has_more else ""))
 
-    # 카드 렌더링
+    # 테이블 렌더링
     # 판단 근거:
     # - 데이터가 없을 때는 빈 화면 대신 명시적 메시지로 사용자 혼선을 방지
-    if not recalls:
+    # - 행마다 카드/컬럼/expander 위젯을 만들면 최대 500행 × 10여 개 위젯이 매 rerun마다 생성됨
+    #   → st.dataframe 한 번으로 렌더링하고, 상세 내용은 선택한 행에 대해서만 표시
+    if recalls.empty:
         st.info("조건에 해당하는 리콜 정보가 없습니다.")
     else:
-        for r in recalls:
-            with st.container(border=True):
-                # 상단 3열: 구분 / 제조사+차명 / 대상수량
-                # 판단 근거:
-                # - 사용자가 즉시 비교하는 핵심 메타를 1행에 집약
-                top = st.columns([1.2, 4.5, 1.3])
-
-                with top[0]:
-                    st.markdown(f"**구분**: {r.scope}")
-
-                with top[1]:
-                    st.markdown(f"**{r.maker}**  \n{r.car_name}")
-
-                with top[2]:
-                    st.markdown(f"**대상수량**  \n{int(r.target_units):,}대")
+        event = st.dataframe(
+            recalls,
+            use_container_width=True,
+            hide_index=True,
+            column_order=["scope", "maker", "car_name", "start_date", "end_date", "target_units"],
+            column_config={
+                "scope": st.column_config.TextColumn("구분"),
+                "maker": st.column_config.TextColumn("제작사"),
+                "car_name": st.column_config.TextColumn("차명"),
+                "start_date": st.column_config.DateColumn("생산 시작", format="YYYY-MM-DD"),
+                "end_date": st.column_config.DateColumn("생산 종료", format="YYYY-MM-DD"),
+                "target_units": st.column_config.NumberColumn("대상수량", format="%d대"),
+            },
+            on_select="rerun",
+            selection_mode="single-row",
+            key="recall_table",
+        )
 
+        # 상세 보기: 선택한 행의 결함내용/시정방법/기타문의 표시
+        # - 필터 변경 직후에는 이전 선택 행 번호가 범위를 벗어날 수 있어 함께 확인
+        selected_rows = [i for i in event.selection.rows if i < len(recalls)]
+        if not selected_rows:
+            st.caption("행을 선택하면 결함내용/시정방법/기타문의를 확인할 수 있습니다.")
+        else:
+            r = recalls.iloc[selected_rows[0]]
+            with st.container(border=True):
+                st.markdown(f"**{r.maker}**  \n{r.car_name}")
                 st.markdown(f"**생산기간**: {r.start_date.date()} ~ {r.end_date.date()}")
 
-                # 상세 내용은 접었다 펴는 형태로 노출(정보 과밀 방지)
-                with st.expander("상세 보기", expanded=False):
-                    st.markdown("**결함내용**")
-                    st.text(r.defect_text)
-
-                    st.markdown("**시정방법**")
-                    st.write(r.fix_text)
-
-                    st.markdown("**기타문의**")
-                    st.write(r.contact_text)
+                st.markdown("**결함내용**")
+                st.text(r.defect_text)
+
+                st.markdown("**시정방법**")
+                st.write(r.fix_text)
+
+                st.markdown("**기타문의**")
+                st.write(r.contact_text)
+
+        if has_more and st.button("더 보기", key="recall_more"):
+            last = recalls.iloc[-1]
+            # end_date가 NULL(NaT)인 행에서 끝났으면 (None, recall_id) 커서로 NULL 행을 이어서 조회
+            last_end_date = None if pd.isna(last.end_date) else last.end_date.to_pydatetime()
+            try:
+                page_loaded_at, (page, has_more) = load_recall_page((last_end_date, int(last.recall_id)))
+            except Exception as e:
+                st.error(str(e))
+                st.stop()
+            # 이어 붙인 목록으로 같은 키의 메모를 교체(concat은 "더 보기" 시 한 번만 수행)
+            # - 조회 시각은 가장 먼저 조회한 페이지 기준(목록 전체가 CACHE_TTL 안에서만 재사용되도록)
+            _memo_put(
+                recall_key,
+                min(recall_loaded_at, page_loaded_at),
+                (pd.concat([recalls, page], ignore_index=True), has_more),
+            )
+            st.rerun()
 
 # =========================
 # [탭 2] 통계
@@ -175,21 +386,34 @@ with tab_stats:
         stat_maker = st.selectbox("제작사", stat_makers, index=0, key="stat_maker")
 
     with s3:
-        year_options = ["전체"] + years
-        기준연도_ui = st.selectbox("기준 연도", year_options, index=0, key="stat_year")
+        기준연도_ui = st.selectbox("기준 연도", YEAR_OPTIONS, index=0, key="stat_year")
 
     # "전체" → 연도 필터 미적용(None)
-    기준연도_param = None if 기준연도_ui == "전체" else int(기준연도_ui)
+    기준연도_param = None if 기준연도_ui == "전체" else 기준연도_ui
 
-    # KPI
+    # KPI / 제조사 랭킹 / 모델 랭킹 일괄 조회 + 연도별 추이 조회
     # 판단 근거:
+    # - 세 집계는 동일한 필터 결과를 공유하므로 한 번의 DB 왕복으로 함께 조회
+    # - 연도별 추이는 별도 쿼리이므로 위 조회와 동시에 실행
     # - KPI는 사용자에게 즉각적인 요약(건수/대수)을 제공하는 핵심 지표이므로 최상단에 배치
+    min_y, max_y = years[0], years[-1]
     try:
-        total_cnt, total_units = fetch_kpi(stat_scope, stat_maker, 기준연도_param)
+        stats, trend = session_memo_many([
+            (
+                ("stats", stat_scope, stat_maker, 기준연도_param, 20),
+                lambda: cached_stats(stat_scope, stat_maker, 기준연도_param, top_n=20),
+            ),
+            (
+                ("trend", stat_scope, stat_maker, min_y, max_y),
+                lambda: cached_year_trend(stat_scope, stat_maker, min_y, max_y),
+            ),
+        ])
     except Exception as e:
         st.error(str(e))
         st.stop()
 
+    (total_cnt, total_units), maker_rows, model_rows = stats
+
     k1, k2 = st.columns(2)
     k1.metric(
         "총 리콜 건수",
@@ -212,16 +436,15 @@ with tab_stats:
     # -------------------------
     with left:
         st.markdown("### 제조사별 리콜 현황 (리콜 건수 기준)")
-        rows = fetch_maker_ranking(stat_scope, stat_maker, 기준연도_param, top_n=20)
 
-        if not rows:
+        if not maker_rows:
             st.info("표시할 데이터가 없습니다.")
         else:
             # 판단 근거:
             # - st.bar_chart는 DataFrame 기반이 가장 안정적이며,
             #   x/y 컬럼명 지정으로 Streamlit APIException(리스트 전달 등)을 예방
-            df_maker = pd.DataFrame(rows, columns=["maker", "recall_cnt"])
-            df_maker["recall_cnt"] = df_maker["recall_cnt"].astype(int)
+            # - 건수는 SQL에서 정수로 반환되므로 행 단위 변환 없이 컬럼 dtype만 한 번에 지정
+            df_maker = pd.DataFrame(maker_rows, columns=["maker", "recall_cnt"]).astype({"recall_cnt": "int32"})
 
             st.bar_chart(df_maker, x="maker", y="recall_cnt")
 
@@ -230,15 +453,13 @@ with tab_stats:
     # -------------------------
     with right:
         st.markdown("### 연도별 리콜 추이")
-        min_y, max_y = years[0], years[-1]
-        trend = fetch_year_trend(stat_scope, stat_maker, min_y, max_y)
 
         if not trend:
             st.info("표시할 데이터가 없습니다.")
         else:
-            df_trend = pd.DataFrame(trend, columns=["year", "recall_cnt"])
-            df_trend["year"] = df_trend["year"].astype(int)
-            df_trend["recall_cnt"] = df_trend["recall_cnt"].astype(int)
+            df_trend = pd.DataFrame(trend, columns=["year", "recall_cnt"]).astype(
+                {"year": "int32", "recall_cnt": "int32"}
+            )
 
             st.line_chart(df_trend, x="year", y="recall_cnt")
 
@@ -248,9 +469,13 @@ with tab_stats:
     # 모델별 리콜 순위 (Table)
     # -------------------------
     st.markdown("### 모델별 리콜 순위 (건수 기준)")
-    model_rows = fetch_model_ranking(stat_scope, stat_maker, 기준연도_param, top_n=20)
 
     if not model_rows:
         st.info("표시할 데이터가 없습니다.")
     else:
-        st.table([{"car_name": name, "recall_cnt": int(cnt)} for name, cnt in model_rows])
+        # 판단 근거:
+        # - 행마다 dict를 만들지 않고 DataFrame으로 한 번에 구성하여 Arrow로 바로 전송
+        # - 건수는 int32로 충분하므로 전송 크기를 줄임
+        df_model = pd.DataFrame(model_rows, columns=["car_name", "recall_cnt"]).astype({"recall_cnt": "int32"})
+
+        st.dataframe(df_model, hide_index=True, use_container_width=True)
@@ -1,12 +1,17 @@
 # recall_repo.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from contextlib import contextmanager
 from datetime import date, datetime
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import os
+import threading
+from types import MappingProxyType
 import mysql.connector
+import pandas as pd
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
 from dotenv import load_dotenv
 
 # ============================================================
@@ -24,51 +29,134 @@ from dotenv import load_dotenv
 load_dotenv()
 
 HOST = os.getenv("HOST")
-PORT = os.getenv("PORT")
+PORT = os.getenv("PORT") or "3306"
 USER = os.getenv("USER")
 PASSWORD = os.getenv("PASSWORD")
 DATABASE = os.getenv("DATABASE")
 
+# 접속정보 검증은 import 시점에 한 번만 수행
+# - 누락 시 fetch_*마다 같은 DB 오류가 반복되지 않고, 원인을 바로 알 수 있도록 함
+_missing = [name for name, value in (("HOST", HOST), ("USER", USER), ("DATABASE", DATABASE)) if not value]
+if _missing:
+    raise RuntimeError(f"DB 설정 누락(.env): {', '.join(_missing)}")
+
+try:
+    PORT = int(PORT)
+except ValueError:
+    raise RuntimeError(f"DB 설정 오류(.env): PORT는 정수여야 합니다 ({PORT!r})")
+
 # 판단 근거:
 # - 보안 리스크 감소를 위해 민감정보(접속정보)를 코드에 직접 코딩하지 않고 환경변수로 분리
+# - C 확장(mysql-connector-python[cext])은 설치되어 있으면 드라이버가 기본으로 사용(use_pure 지정 불필요):
+#   프로토콜 파싱/행 디코딩을 C에서 처리(행 수가 많은 fetch_recalls에서 효과), 설치 방법은 README 참고
+# - MappingProxyType: 읽기 전용으로 고정하여 실행 중 설정이 바뀌지 않도록 함
 
-DB_CONFIG = {
+DB_CONFIG = MappingProxyType({
     "host": HOST,
     "port": PORT,
     "user": USER,
     "password": PASSWORD,
     "database": DATABASE,
-}
-
+})
 
 # ============================================================
-# 2) DTO (Data Transfer Object)
+# 1-1) CONNECTION POOL
+# - fetch_* 호출마다 TCP 연결/인증을 새로 맺지 않고 풀에서 연결을 재사용
 # ============================================================
 
-@dataclass
-class RecallView:
+POOL_NAME = "recall"
+# 풀 크기: 동시에 빌려줄 수 있는 최대 연결 수
+# - Streamlit은 세션마다 별도 스레드에서 스크립트를 실행하고, 통계 탭(app.session_memo_many)은
+#   세션당 최대 2개 연결을 동시에 사용 → 동시 사용자 수 × 2 정도를 기준으로 조정
+# - 부족하면 _get_conn에서 반납을 기다리므로 오류 대신 대기 시간이 늘어남
+POOL_SIZE = 8
+# 빈 연결을 기다리는 최대 시간(초), 초과 시 PoolError
+POOL_WAIT_TIMEOUT = 30
+
+_pool: Optional[MySQLConnectionPool] = None
+_pool_lock = threading.Lock()
+# 풀에서 빌려간 연결 수를 POOL_SIZE로 제한하는 세마포어
+# - MySQLConnectionPool.get_connection()은 기다리지 않고 즉시 "pool exhausted"를 발생시키므로,
+#   빌리기 전에 여기서 빈 연결이 생길 때까지 대기
+_pool_slots = threading.BoundedSemaphore(POOL_SIZE)
+
+
+def _get_pool() -> MySQLConnectionPool:
     """
-    리콜 목록 화면(카드/리스트)에 필요한 데이터를 담는 DTO(Data Transfer Object).
-
-    필드 정의
-    - scope: 국내/해외 구분(제조사 region_at)
-    - maker: 제조사명
-    - car_name: 모델명
-    - start_date/end_date: 제조기간(또는 해당 모델 생산기간)
-    - target_units: 리콜 대상 대수
-    - defect_text: 결함 설명
-    - fix_text: 조치 방법
-    - contact_text: 리콜 센터/문의처
+    커넥션 풀을 최초 사용 시점에 한 번만 생성하여 반환한다.
+
+    판단 근거
+    - import 시점에 생성하면 DB 미기동/접속정보 오류가 모듈 로딩 실패로 이어짐:
+      첫 조회 시 생성하여 기존과 동일하게 fetch_*의 RuntimeError로 처리되도록 함
+    - pool_reset_session=False:
+      세션 변수/임시테이블을 사용하지 않으므로 반납 시 COM_RESET_CONNECTION 비용 생략
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = MySQLConnectionPool(
+                    pool_name=POOL_NAME,
+                    pool_size=POOL_SIZE,
+                    pool_reset_session=False,
+                    **DB_CONFIG,
+                )
+    return _pool
+
+
+@contextmanager
+def _get_conn() -> Iterator:
     """
-    scope: str
-    maker: str
-    car_name: str
-    start_date: datetime
-    end_date: datetime
-    target_units: int
-    defect_text: str
-    fix_text: str
-    contact_text: str
+    풀에서 연결을 하나 빌려주고, 블록 종료 시 close()로 풀에 반납한다.
+    빈 연결이 없으면 POOL_WAIT_TIMEOUT초까지 반납을 기다린다.
+
+    판단 근거
+    - fetch_*는 일반 cursor()(COM_QUERY, 왕복 1회)를 사용:
+      각 SQL은 호출당 한 번만 실행되므로 prepared statement는 PREPARE/EXECUTE 왕복만 늘고
+      서버 파싱 비용도 줄지 않음
+    """
+    if not _pool_slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+        raise PoolError(f"{POOL_WAIT_TIMEOUT}초 동안 사용 가능한 DB 연결이 없습니다")
+    try:
+        conn = _get_pool().get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+    finally:
+        _pool_slots.release()
+
+
+# ============================================================
+# 2) 리콜 목록 컬럼 정의
+# - fetch_recalls가 반환하는 DataFrame의 컬럼(SELECT 순서와 동일하게 유지)
+# ============================================================
+
+# 컬럼 정의
+# - scope: 국내/해외 구분(제조사 region_at)
+# - maker: 제조사명
+# - car_name: 모델명
+# - start_date/end_date: 제조기간(또는 해당 모델 생산기간)
+# - target_units: 리콜 대상 대수
+# - defect_text: 결함 설명
+# - fix_text: 조치 방법
+# - contact_text: 리콜 센터/문의처
+# - recall_id: 리콜 PK (목록 페이지네이션 커서에 사용)
+#
+# 판단 근거:
+# - 목록은 행 단위 DTO 없이 DataFrame으로 바로 구성하므로 컬럼 이름만 정의
+RECALL_COLUMNS = (
+    "scope",
+    "maker",
+    "car_name",
+    "start_date",
+    "end_date",
+    "target_units",
+    "defect_text",
+    "fix_text",
+    "contact_text",
+    "recall_id",
+)
 
 
 # ============================================================
@@ -76,11 +164,60 @@ class RecallView:
 # - Streamlit에서 전달받은 필터를 SQL WHERE로 변환
 # ============================================================
 
+# FULLTEXT 인덱스의 ngram 토큰 길이 (MySQL ngram_token_size 기본값)
+NGRAM_TOKEN_SIZE = 2
+
+# 조건별 비트 플래그 (검색은 MATCH/LIKE 중 하나만 적용)
+_W_SCOPE = 1
+_W_MAKER = 2
+_W_YEAR = 4
+_W_MATCH = 8
+_W_LIKE = 16
+_W_AFTER = 32
+_W_NULL = 64
+_W_BEFORE_ID = 128
+
+# 조건 조각: 순서가 params 바인딩 순서와 일치해야 함
+_WHERE_SNIPPETS = (
+    (_W_SCOPE, "mf.region_at = %s"),
+    (_W_MAKER, "mf.maker_name = %s"),
+    (_W_YEAR, "md.start_date <= %s AND md.end_date >= %s"),
+    (_W_MATCH, "(MATCH(mf.maker_name) AGAINST (%s IN BOOLEAN MODE)"
+               " OR MATCH(md.model_name) AGAINST (%s IN BOOLEAN MODE))"),
+    (_W_LIKE, "(mf.maker_name LIKE %s OR md.model_name LIKE %s)"),
+    # 페이지 커서: ORDER BY md.end_date DESC, rc.recall_id DESC 기준 다음 행부터
+    # - end_date가 있는 커서: 더 이전 end_date, 같은 end_date의 더 작은 recall_id (NULL 행은 포함하지 않음)
+    # - end_date가 NULL인 커서: NULL 행(DESC 정렬에서 맨 뒤) 중 더 작은 recall_id
+    (_W_AFTER, "(md.end_date < %s OR (md.end_date = %s AND rc.recall_id < %s))"),
+    (_W_NULL, "md.end_date IS NULL"),
+    (_W_BEFORE_ID, "rc.recall_id < %s"),
+)
+
+
+def _compile_where(flags: int) -> str:
+    """
+    플래그 조합에 해당하는 WHERE 절 문자열을 만든다. (모듈 로딩 시에만 호출)
+    """
+    where = [snippet for bit, snippet in _WHERE_SNIPPETS if flags & bit]
+    return f"WHERE {' AND '.join(where)}" if where else ""
+
+
+# 가능한 모든 조건 조합의 WHERE 절을 미리 만들어 둠
+# - _build_where는 호출 시 문자열 조립 없이 플래그로 조회하고 params만 채움
+_WHERE_CACHE = {
+    flags: _compile_where(flags)
+    for flags in range(_W_BEFORE_ID * 2)
+    if not (flags & _W_MATCH and flags & _W_LIKE)
+    and not (flags & _W_AFTER and flags & (_W_NULL | _W_BEFORE_ID))
+}
+
+
 def _build_where(
         scope: str,
         maker: str,
         manufacture_year: Optional[int],
         search_text: str,
+        after: Optional[Tuple[Optional[datetime], Optional[int]]] = None,
 ) -> Tuple[str, List]:
     """
     Streamlit 필터 입력값을 기반으로 공통 WHERE 절과 파라미터 리스트를 생성한다.
@@ -90,6 +227,8 @@ def _build_where(
     - maker: "전체" 또는 제조사명
     - manufacture_year: 특정 연도 필터(없으면 None)
     - search_text: 제조사/차명 검색어(없으면 "")
+    - after: 목록 페이지네이션 커서 (end_date, recall_id), 해당 행 이후만 조회(없으면 None)
+      end_date가 NULL인 행에서 끝난 페이지는 (None, recall_id), NULL 행의 첫 페이지는 (None, None)
 
     Returns
     - (where_sql, params)
@@ -101,18 +240,22 @@ def _build_where(
       (1) SQL 인젝션 방지 (2) 쿼리 캐시/실행 안정성
     - 필터 조건 조립을 한 곳에서 처리:
       (1) fetch_* 함수들 간 조건 일관성 보장 (2) 변경 시 단일 지점 수정 (3) 디버깅 단순화
+    - 조건 컬럼(region_at, maker_name, start_date/end_date)과 JOIN 키는 sql/indexes.sql의
+      인덱스를 전제로 함: 조건을 추가/변경하면 인덱스 정의도 함께 검토
+    - WHERE 절 문자열은 _WHERE_CACHE에 미리 만들어 둔 것을 사용:
+      fetch_*마다 반복되는 문자열 조립을 없애고, 같은 조건 조합은 항상 같은 SQL이 되도록 함
     """
-    where = []
+    flags = 0
     params: List = []
 
     # scope: "전체"면 미적용, 아니면 제조사 테이블의 region_at으로 필터
     if scope != "전체":
-        where.append("mf.region_at = %s")
+        flags |= _W_SCOPE
         params.append(scope)
 
     # maker: "전체"면 미적용, 아니면 제조사명 필터
     if maker != "전체":
-        where.append("mf.maker_name = %s")
+        flags |= _W_MAKER
         params.append(maker)
 
     # 제조연도: 기간 겹침 포함 (start_date <= 12/31 AND end_date >= 01/01)
@@ -120,22 +263,45 @@ def _build_where(
     if manufacture_year is not None:
         y_start = date(manufacture_year, 1, 1)
         y_end = date(manufacture_year, 12, 31)
-        where.append("md.start_date <= %s AND md.end_date >= %s")
+        flags |= _W_YEAR
         params.extend([y_end, y_start])
 
     # 검색: 제조사/차명
     # - UI에서 단일 검색창으로 제조사/차명을 동시에 탐색하는 UX 요구를 반영
-    # - LIKE는 부분일치 검색을 제공(정확 일치보다 사용성 우선)
-    # - CONCAT('%', %s, '%') 형태로 바인딩하여 escaping/인젝션 위험을 낮춤
+    # - 앞자리 '%' LIKE는 인덱스를 쓰지 못해 전체 스캔이 발생
+    #   → FULLTEXT(ngram) 인덱스(sql/indexes.sql)로 MATCH ... AGAINST 검색
+    # - 검색어를 큰따옴표로 감싼 구문(phrase) 검색:
+    #   ngram 토큰이 연속으로 일치해야 하므로 기존 부분일치(LIKE)에 가까운 결과를 주고,
+    #   (stopword를 끄고 인덱스를 만들어야 함: sql/indexes.sql 참고)
+    #   사용자 입력의 +, -, * 등이 BOOLEAN MODE 연산자로 해석되지 않음
+    # - ngram 토큰 길이보다 짧은 검색어는 FULLTEXT로 찾을 수 없어 LIKE로 대체
     s = (search_text or "").strip()
     if s:
-        where.append(
-            "(mf.maker_name LIKE CONCAT('%', %s, '%') OR md.model_name LIKE CONCAT('%', %s, '%'))"
-        )
-        params.extend([s, s])
-
-    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
-    return where_sql, params
+        if len(s) >= NGRAM_TOKEN_SIZE:
+            phrase = '"' + s.replace('"', " ") + '"'
+            flags |= _W_MATCH
+            params.extend([phrase, phrase])
+        else:
+            # LIKE 패턴은 Python에서 만들어 바인딩(행마다 서버에서 CONCAT 평가하지 않음)
+            pattern = f"%{s}%"
+            flags |= _W_LIKE
+            params.extend([pattern, pattern])
+
+    # 페이지네이션 커서: ORDER BY md.end_date DESC, rc.recall_id DESC 기준으로 커서 다음 행부터
+    # - end_date는 중복될 수 있으므로 recall_id를 함께 비교해 누락/중복 없이 이어서 조회
+    # - end_date가 NULL인 행은 범위 조건에 걸리지 않으므로 별도 단계(md.end_date IS NULL)로 조회
+    if after is not None:
+        after_end_date, after_recall_id = after
+        if after_end_date is None:
+            flags |= _W_NULL
+            if after_recall_id is not None:
+                flags |= _W_BEFORE_ID
+                params.append(int(after_recall_id))
+        else:
+            flags |= _W_AFTER
+            params.extend([after_end_date, after_end_date, int(after_recall_id)])
+
+    return _WHERE_CACHE[flags], params
 
 
 # ============================================================
@@ -148,28 +314,40 @@ def fetch_recalls(
         manufacture_year: Optional[int] = None,
         search_text: str = "",
         limit: int = 500,
-) -> List[RecallView]:
+        after: Optional[Tuple[Optional[datetime], Optional[int]]] = None,
+) -> pd.DataFrame:
     """
     Streamlit '리콜 목록' 화면에서 사용할 리스트 데이터를 조회한다.
 
     Args
     - scope/maker/manufacture_year/search_text: UI 필터 값
-    - limit: 과도한 조회로 인한 UI 렌더링/DB 부하 방지를 위한 상한
+    - limit: 한 번에 조회할 행 수(페이지 크기), 과도한 조회로 인한 UI 렌더링/DB 부하 방지
+    - after: 이전 페이지 마지막 행의 (end_date, recall_id), 첫 페이지는 None
 
     Returns
-    - List[RecallView]: 카드 UI에 바로 사용할 DTO 리스트
+    - pd.DataFrame: RECALL_COLUMNS를 컬럼으로 갖는 테이블
 
     판단 근거
     - ORDER BY md.end_date DESC:
       최신 생산기간(또는 최신 모델/기간)의 정보를 상단에 보여주는 것이 사용자 의사결정(최신 이슈 확인)에 유리
-    - LIMIT 기본 500:
-      Streamlit에서 카드 리스트가 지나치게 길면 UX/성능 저하가 발생하므로 적정 상한을 둠
+    - end_date가 NULL인 행은 DESC 정렬에서 맨 뒤에 오며, end_date가 있는 커서의 범위 조건에는 걸리지 않음:
+      그 페이지가 limit보다 짧으면(end_date가 있는 행을 다 읽으면) 같은 연결에서 NULL 행을 처음부터 이어서 채움
+    - LIMIT(페이지 크기):
+      화면은 한 페이지씩 "더 보기"로 이어 붙이므로, 한 번의 조회/렌더링 부담을 페이지 크기로 제한
     - COALESCE 사용:
       NULL이 UI로 그대로 노출되면 레이아웃 깨짐/표현 불명확이 발생 → 빈 문자열/0으로 표준화
+    - DataFrame 반환:
+      행 단위 DTO/카드 위젯 생성 없이 st.dataframe 한 번으로 렌더링할 수 있도록 함
+    - 키셋 페이지네이션(after):
+      OFFSET 없이 (end_date, recall_id) 이후 행만 조건으로 걸러, 앞 페이지 행을 읽고 버리는 비용을 없앰
+      (정렬 키가 tbl_model.end_date와 tbl_recall.recall_id 두 테이블에 걸쳐 있어 인덱스 순서로 읽을 수는 없음:
+       조건에 맞는 행을 정렬(filesort)한 뒤 limit행만 반환)
     """
-    where_sql, params = _build_where(scope, maker, manufacture_year, search_text)
+    queries = [_build_where(scope, maker, manufacture_year, search_text, after)]
+    if after is not None and after[0] is not None:
+        queries.append(_build_where(scope, maker, manufacture_year, search_text, (None, None)))
 
-    sql = f"""
+    sql = """
         SELECT
             COALESCE(mf.region_at, '')        AS scope,
             COALESCE(mf.maker_name, '')       AS maker,
@@ -179,31 +357,32 @@ def fetch_recalls(
             COALESCE(rc.recall_quantity, 0)   AS target_units,
             COALESCE(rc.defect_desc, '')      AS defect_text,
             COALESCE(rc.fix_method, '')       AS fix_text,
-            COALESCE(rc.recall_center, '')    AS contact_text
+            COALESCE(rc.recall_center, '')    AS contact_text,
+            rc.recall_id                      AS recall_id
         FROM tbl_recall rc
         JOIN tbl_model md
           ON rc.model_id = md.model_id
         JOIN tbl_manufacturer mf
           ON md.maker_id = mf.maker_id
         {where_sql}
-        ORDER BY md.end_date DESC
+        ORDER BY md.end_date DESC, rc.recall_id DESC
         LIMIT %s
     """
 
-    params.append(int(limit))
-
-    out: List[RecallView] = []
+    rows: List[tuple] = []
     try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
+        with _get_conn() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql, tuple(params))
-                for row in cursor.fetchall():
-                    out.append(RecallView(*row))
+                for where_sql, params in queries:
+                    if len(rows) >= limit:
+                        break
+                    cursor.execute(sql.format(where_sql=where_sql), (*params, int(limit) - len(rows)))
+                    rows += cursor.fetchall()
     # - DB 레이어에서 예외를 RuntimeError로 래핑하면, 에러 핸들링이 쉬워짐
     except mysql.connector.Error as err:
         raise RuntimeError(f"DB 오류(fetch_recalls): {err}")
 
-    return out
+    return pd.DataFrame(rows, columns=RECALL_COLUMNS)
 
 
 # ============================================================
@@ -226,28 +405,28 @@ def fetch_makers(scope: str = "전체") -> List[str]:
     - scope가 "전체"일 때는 필터 미적용:
       전체 스코프에서는 국내/해외 제조사를 합쳐서 보여주는 것이 자연스러운 UX
     """
-    where_sql = ""
+    # 빈 제조사명(NULL/'')은 드롭다운에 표시하지 않으므로 SQL에서 제외
+    where = ["maker_name IS NOT NULL", "maker_name <> ''"]
     params: List = []
 
     if scope != "전체":
-        where_sql = "WHERE region_at = %s"
+        where.append("region_at = %s")
         params.append(scope)
 
     sql = f"""
         SELECT DISTINCT maker_name
         FROM tbl_manufacturer
-        {where_sql}
+        WHERE {' AND '.join(where)}
         ORDER BY maker_name
     """
 
     out: List[str] = []
     try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
+        with _get_conn() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(sql, tuple(params))
-                for (maker_name,) in cursor.fetchall():
-                    if maker_name:
-                        out.append(maker_name)
+                # 커서를 직접 순회하여 fetchall() 중간 리스트 생략
+                out = [row[0] for row in cursor]
     except mysql.connector.Error as err:
         raise RuntimeError(f"DB 오류(fetch_makers): {err}")
 
@@ -268,19 +447,19 @@ def fetch_year_range() -> Tuple[int, int]:
     판단 근거
     - start_date/end_date 기준으로 범위를 계산:
       데이터가 추가되어도 UI 옵션 범위가 자동으로 확장되도록 함
+    - 요약 테이블(tbl_model_year_range, sql/year_range.sql) 1행 조회:
+      tbl_model 전체 MIN/MAX 집계 대신 트리거로 유지되는 값을 PK로 읽음
     - NULL 데이터 방어:
       데이터 적재 누락/초기 세팅에서 MIN/MAX가 NULL일 수 있으므로 fallback 제공
     """
     sql = """
-          SELECT MIN(YEAR (start_date)) AS min_year,
-                 MAX(YEAR (end_date))   AS max_year
-          FROM tbl_model
-          WHERE start_date IS NOT NULL
-            AND end_date IS NOT NULL \
+          SELECT min_year, max_year
+          FROM tbl_model_year_range
+          WHERE id = 1
           """
 
     try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
+        with _get_conn() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(sql)
                 row = cursor.fetchone()
@@ -293,100 +472,103 @@ def fetch_year_range() -> Tuple[int, int]:
 
 
 # ============================================================
-# 7) 통계: KPI (건수/대수)
+# 7) 통계: KPI + 제조사/모델 랭킹 (TOP N)
 # ============================================================
 
-def fetch_kpi(scope: str, maker: str, year: int) -> Tuple[int, int]:
-    """
-    대시보드 KPI(리콜 건수, 리콜 대상 대수)를 조회한다.
-
-    Args
-    - scope/maker/year: KPI에 적용할 필터
-
-    Returns
-    - (recall_cnt, total_units)
-
-    판단 근거
-    - SUM(recall_quantity)는 NULL 가능성이 있어 COALESCE로 0 처리:
-      KPI 카드에 NULL 표시 방지 및 계산 안정성 확보
-    - search_text는 KPI에서 제외:
-      KPI는 '필터 기반 요약'이 목적이므로, 검색어는 목록 탐색에만 적용(해석 혼선 방지)
-    """
-    where_sql, params = _build_where(scope, maker, year, search_text="")
-
-    sql = f"""
-        SELECT
-            COUNT(*) AS recall_cnt,
-            COALESCE(SUM(COALESCE(rc.recall_quantity, 0)), 0) AS total_units
-        FROM tbl_recall rc
-        JOIN tbl_model md
-          ON rc.model_id = md.model_id
-        JOIN tbl_manufacturer mf
-          ON md.maker_id = mf.maker_id
-        {where_sql}
-    """
-
-    try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(sql, tuple(params))
-                cnt, units = cursor.fetchone()
-                return int(cnt or 0), int(units or 0)
-    except mysql.connector.Error as err:
-        raise RuntimeError(f"DB 오류(fetch_kpi): {err}")
+# 결과 행 구분값 (UNION ALL로 합친 결과를 섹션별로 다시 나누기 위한 태그)
+_STATS_KPI = 0
+_STATS_MAKER = 1
+_STATS_MODEL = 2
 
 
-# ============================================================
-# 8) 통계: 제조사별 리콜 건수 TOP N
-# ============================================================
-
-def fetch_maker_ranking(scope: str, maker: str, year: int, top_n: int = 20):
+def fetch_stats(scope: str, maker: str, year: Optional[int], top_n: int = 20):
     """
-    제조사별 리콜 건수 랭킹을 조회한다.
+    통계 탭의 KPI, 제조사별 랭킹, 모델별 랭킹을 한 번의 쿼리로 조회한다.
 
     Args
     - scope/maker/year: 필터
-    - top_n: 상위 N개 반환
+    - top_n: 랭킹별 상위 N개 반환
 
     Returns
-    - List[Tuple[maker, recall_cnt]]
+    - ((recall_cnt, total_units), maker_rows, model_rows)
+      - maker_rows: List[Tuple[maker, recall_cnt]]
+      - model_rows: List[Tuple[car_name, recall_cnt]]
 
     판단 근거
-    - LIMIT top_n:
-      막대그래프/테이블에서 과도한 항목은 가독성을 떨어뜨리므로 상위 N개로 컷오프
+    - KPI/제조사 랭킹/모델 랭킹은 동일한 JOIN + WHERE 결과를 집계:
+      WITH base로 필터링된 행 집합을 한 번 만들고 세 집계를 UNION ALL로 묶어 왕복 1회로 처리
+    - search_text는 통계에서 제외:
+      통계는 '필터 기반 요약'이 목적이므로, 검색어는 목록 탐색에만 적용(해석 혼선 방지)
+    - SUM(recall_quantity)는 NULL 가능성이 있어 COALESCE로 0 처리:
+      KPI 카드에 NULL 표시 방지 및 계산 안정성 확보
+    - 랭킹은 ORDER BY cnt DESC + LIMIT top_n:
+      리콜이 많은 제조사/모델을 상단에 노출하고, 과도한 항목은 가독성을 떨어뜨리므로 상위 N개로 컷오프
+    - 다중 결과셋(multi statement) 대신 단일 문장 사용:
+      CTE는 문장 단위로만 유효하므로 여러 문장으로 나누면 base를 공유할 수 없음
+    - 연도별 추이는 연도 필터 대신 연도 시퀀스 JOIN이 필요하므로 fetch_year_trend로 별도 조회
     """
-    where_sql, params = _build_where(scope, maker, year, search_text="")
+    where_sql, where_params = _build_where(scope, maker, year, search_text="")
 
     sql = f"""
-        SELECT
-            mf.maker_name AS maker,
-            COUNT(*)      AS recall_cnt
-        FROM tbl_recall rc
-        JOIN tbl_model md
-          ON rc.model_id = md.model_id
-        JOIN tbl_manufacturer mf
-          ON md.maker_id = mf.maker_id
-        {where_sql}
-        GROUP BY mf.maker_name
-        ORDER BY recall_cnt DESC
-        LIMIT %s
+        WITH base AS (
+            SELECT
+                mf.maker_name      AS maker,
+                md.model_name      AS car_name,
+                rc.recall_quantity AS units
+            FROM tbl_recall rc
+            JOIN tbl_model md
+              ON rc.model_id = md.model_id
+            JOIN tbl_manufacturer mf
+              ON md.maker_id = mf.maker_id
+            {where_sql}
+        )
+        SELECT sec, name, cnt, units
+        FROM (
+            SELECT
+                {_STATS_KPI}                            AS sec,
+                NULL                                    AS name,
+                CAST(COUNT(*) AS SIGNED)                AS cnt,
+                CAST(COALESCE(SUM(COALESCE(units, 0)), 0) AS SIGNED) AS units
+            FROM base
+            UNION ALL
+            (SELECT {_STATS_MAKER}, maker, CAST(COUNT(*) AS SIGNED) AS cnt, NULL
+             FROM base
+             GROUP BY maker
+             ORDER BY cnt DESC
+             LIMIT %s)
+            UNION ALL
+            (SELECT {_STATS_MODEL}, car_name, CAST(COUNT(*) AS SIGNED) AS cnt, NULL
+             FROM base
+             GROUP BY car_name
+             ORDER BY cnt DESC
+             LIMIT %s)
+        ) t
+        ORDER BY sec, cnt DESC
     """
-    params.append(int(top_n))
+    params = where_params + [int(top_n), int(top_n)]
 
-    rows = []
+    kpi = (0, 0)
+    maker_rows = []
+    model_rows = []
     try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
+        with _get_conn() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(sql, tuple(params))
-                rows = cursor.fetchall()
+                for sec, name, cnt, units in cursor:
+                    if sec == _STATS_KPI:
+                        kpi = (cnt, units)
+                    elif sec == _STATS_MAKER:
+                        maker_rows.append((name, cnt))
+                    else:
+                        model_rows.append((name, cnt))
     except mysql.connector.Error as err:
-        raise RuntimeError(f"DB 오류(fetch_maker_ranking): {err}")
+        raise RuntimeError(f"DB 오류(fetch_stats): {err}")
 
-    return rows
+    return kpi, maker_rows, model_rows
 
 
 # ============================================================
-# 9) 통계: 연도별 추이
+# 8) 통계: 연도별 추이
 # ============================================================
 
 def fetch_year_trend(scope: str, maker: str, min_year: int, max_year: int):
@@ -399,60 +581,52 @@ def fetch_year_trend(scope: str, maker: str, min_year: int, max_year: int):
 
     Returns
     - List[Tuple[year, recall_cnt]]
-    """
-    trend = []
-    for y in range(min_year, max_year + 1):
-        cnt, _ = fetch_kpi(scope, maker, y)
-        trend.append((y, cnt))
-    return trend
-
-
-# ============================================================
-# 10) 통계: 모델별 리콜 순위 TOP N
-# ============================================================
-
-def fetch_model_ranking(scope: str, maker: str, year: int, top_n: int = 20):
-    """
-    모델(차명) 단위의 리콜 건수 랭킹을 조회한다.
-
-    Args
-    - scope/maker/year: 필터
-    - top_n: 상위 N개 반환
-
-    Returns
-    - List[Tuple[car_name, recall_cnt]]
 
     판단 근거
-    - GROUP BY md.model_name:
-      사용자 관점에서 '차종/모델별 리콜 빈도'가 핵심 비교 포인트이므로 모델명 기준 집계
-    - ORDER BY recall_cnt DESC:
-      리콜이 많은 모델을 상단에 노출해 리스크 기반 탐색을 지원
+    - 연도마다 KPI 건수를 따로 조회하면 연도 수만큼 DB 연결/쿼리가 발생:
+      WITH RECURSIVE로 연도 시퀀스를 만들고 GROUP BY 한 번으로 집계(왕복 1회)
+    - LEFT JOIN + COUNT(b.recall_id):
+      리콜이 없는 연도도 0건으로 포함되어 추이 그래프의 x축이 끊기지 않음
+    - 연도 조건은 _build_where의 제조연도 필터와 동일한 기간 겹침 기준
+      (start_date <= 12/31 AND end_date >= 01/01)을 JOIN 조건으로 적용
     """
-    where_sql, params = _build_where(scope, maker, year, search_text="")
+    # 연도 조건은 JOIN에서 처리하므로 scope/maker 조건만 사용
+    where_sql, where_params = _build_where(scope, maker, None, search_text="")
 
     sql = f"""
+        WITH RECURSIVE years (yr) AS (
+            SELECT CAST(%s AS SIGNED)
+            UNION ALL
+            SELECT yr + 1 FROM years WHERE yr < %s
+        )
         SELECT
-            md.model_name AS car_name,
-            COUNT(*)      AS recall_cnt
-        FROM tbl_recall rc
-        JOIN tbl_model md
-          ON rc.model_id = md.model_id
-        JOIN tbl_manufacturer mf
-          ON md.maker_id = mf.maker_id
-        {where_sql}
-        GROUP BY md.model_name
-        ORDER BY recall_cnt DESC
-        LIMIT %s
+            y.yr                                 AS year,
+            CAST(COUNT(b.recall_id) AS SIGNED)   AS recall_cnt
+        FROM years y
+        LEFT JOIN (
+            SELECT rc.recall_id, md.start_date, md.end_date
+            FROM tbl_recall rc
+            JOIN tbl_model md
+              ON rc.model_id = md.model_id
+            JOIN tbl_manufacturer mf
+              ON md.maker_id = mf.maker_id
+            {where_sql}
+        ) b
+          ON b.start_date <= MAKEDATE(y.yr, 1) + INTERVAL 1 YEAR - INTERVAL 1 DAY
+         AND b.end_date >= MAKEDATE(y.yr, 1)
+        GROUP BY y.yr
+        ORDER BY y.yr
     """
-    params.append(int(top_n))
+    params = [int(min_year), int(max_year)] + where_params
 
-    rows = []
+    trend = []
     try:
-        with mysql.connector.connect(**DB_CONFIG) as conn:
+        with _get_conn() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(sql, tuple(params))
-                rows = cursor.fetchall()
+                # year/recall_cnt 모두 SQL에서 정수형으로 반환되므로 변환 없이 사용
+                trend = list(cursor)
     except mysql.connector.Error as err:
-        raise RuntimeError(f"DB 오류(fetch_model_ranking): {err}")
+        raise RuntimeError(f"DB 오류(fetch_year_trend): {err}")
 
-    return rows
+    return trend
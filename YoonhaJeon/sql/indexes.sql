@@ -0,0 +1,36 @@
+-- indexes.sql
+-- ============================================================
+-- recall_repo.py 조회 패턴에 맞춘 인덱스
+-- - _build_where 조건: mf.region_at / mf.maker_name / md.start_date~md.end_date 기간 겹침
+-- - JOIN 경로: rc.model_id → md.model_id, md.maker_id → mf.maker_id
+-- - 정렬: fetch_recalls의 ORDER BY md.end_date DESC
+-- 적용: 기존 DB에 한 번만 실행 (MySQL 8.0 이상, 내림차순 인덱스 사용)
+-- ============================================================
+
+-- 제조사: scope/maker 필터 + maker_id JOIN을 인덱스만으로 처리(커버링)
+CREATE INDEX idx_mf_region_name
+    ON tbl_manufacturer (region_at, maker_name, maker_id);
+
+-- 모델: maker_id JOIN 후 end_date DESC 정렬/기간 겹침 필터를 인덱스 역순 스캔으로 처리
+CREATE INDEX idx_md_maker_dates
+    ON tbl_model (maker_id, end_date DESC, start_date, model_id, model_name);
+
+-- 리콜: model_id JOIN + 대상수량 집계(SUM)를 커버링
+CREATE INDEX idx_rc_model
+    ON tbl_recall (model_id, recall_quantity);
+
+-- 검색(제조사/차명): 앞자리 '%' LIKE 대신 MATCH ... AGAINST 사용
+-- - 한글은 공백 기준 기본 파서로 부분 검색이 되지 않으므로 ngram 파서 사용
+-- - ngram_token_size(기본 2)는 recall_repo.NGRAM_TOKEN_SIZE와 일치해야 함
+-- - stopword 비활성화 필수:
+--   ngram 파서는 기본 영문 stopword 목록(a, i, in, to, or, la ...)을 포함하는 토큰을 모두 버리므로
+--   영문 제조사/모델명의 토큰이 빠지고 "in", "ai" 같은 검색은 아무것도 찾지 못함
+--   → 인덱스 생성 전에 같은 세션에서 stopword를 끔 (이미 만든 인덱스는 DROP 후 다시 생성)
+--   → 이후 ALTER TABLE ... FORCE / OPTIMIZE TABLE로 인덱스를 다시 만들 때도 같은 설정 필요
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE tbl_manufacturer
+    ADD FULLTEXT INDEX ft_maker (maker_name) WITH PARSER ngram;
+
+ALTER TABLE tbl_model
+    ADD FULLTEXT INDEX ft_model (model_name) WITH PARSER ngram;
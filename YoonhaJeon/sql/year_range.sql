@@ -0,0 +1,66 @@
+-- year_range.sql
+-- ============================================================
+-- 제조연도 범위 요약 테이블
+-- - fetch_year_range가 tbl_model 전체를 MIN/MAX 집계하지 않고 1행만 읽도록 함
+-- - tbl_model의 INSERT/UPDATE/DELETE는 트리거로 자동 갱신
+-- - TRUNCATE TABLE은 DELETE 트리거를 실행하지 않음:
+--   tbl_model을 TRUNCATE 후 다시 적재(CSV Import 등)했으면 파일 끝의 재집계 문을 실행
+-- 적용: 기존 DB에 한 번만 실행
+-- ============================================================
+
+CREATE TABLE tbl_model_year_range (
+    id       TINYINT NOT NULL PRIMARY KEY,
+    min_year INT NULL,
+    max_year INT NULL
+);
+
+-- 초기 적재: 기존 fetch_year_range 집계와 동일한 기준
+INSERT INTO tbl_model_year_range (id, min_year, max_year)
+SELECT 1, MIN(YEAR(start_date)), MAX(YEAR(end_date))
+FROM tbl_model
+WHERE start_date IS NOT NULL
+  AND end_date IS NOT NULL;
+
+-- INSERT: 새 모델의 연도로 범위만 확장 (전체 재집계 불필요)
+CREATE TRIGGER trg_model_year_range_ins
+    AFTER INSERT ON tbl_model
+    FOR EACH ROW
+    UPDATE tbl_model_year_range
+    SET min_year = LEAST(COALESCE(min_year, YEAR(NEW.start_date)), YEAR(NEW.start_date)),
+        max_year = GREATEST(COALESCE(max_year, YEAR(NEW.end_date)), YEAR(NEW.end_date))
+    WHERE id = 1
+      AND NEW.start_date IS NOT NULL
+      AND NEW.end_date IS NOT NULL;
+
+-- UPDATE/DELETE: 범위가 줄어들 수 있으므로 재집계
+-- - FOR EACH ROW 트리거이므로 조건 없이 재집계하면 N행 일괄 변경 시 전체 집계가 N번 실행됨
+--   → 기간(start_date/end_date)이 바뀐 경우(UPDATE), 현재 최소/최대 연도의 행이 삭제된 경우(DELETE)에만 재집계
+CREATE TRIGGER trg_model_year_range_upd
+    AFTER UPDATE ON tbl_model
+    FOR EACH ROW
+    UPDATE tbl_model_year_range
+    SET min_year = (SELECT MIN(YEAR(start_date)) FROM tbl_model
+                    WHERE start_date IS NOT NULL AND end_date IS NOT NULL),
+        max_year = (SELECT MAX(YEAR(end_date)) FROM tbl_model
+                    WHERE start_date IS NOT NULL AND end_date IS NOT NULL)
+    WHERE id = 1
+      AND NOT (OLD.start_date <=> NEW.start_date AND OLD.end_date <=> NEW.end_date);
+
+CREATE TRIGGER trg_model_year_range_del
+    AFTER DELETE ON tbl_model
+    FOR EACH ROW
+    UPDATE tbl_model_year_range
+    SET min_year = (SELECT MIN(YEAR(start_date)) FROM tbl_model
+                    WHERE start_date IS NOT NULL AND end_date IS NOT NULL),
+        max_year = (SELECT MAX(YEAR(end_date)) FROM tbl_model
+                    WHERE start_date IS NOT NULL AND end_date IS NOT NULL)
+    WHERE id = 1
+      AND (YEAR(OLD.start_date) = min_year OR YEAR(OLD.end_date) = max_year);
+
+-- 재집계: 트리거를 거치지 않은 변경(TRUNCATE 후 재적재 등) 뒤에 수동 실행
+-- UPDATE tbl_model_year_range
+-- SET min_year = (SELECT MIN(YEAR(start_date)) FROM tbl_model
+--                 WHERE start_date IS NOT NULL AND end_date IS NOT NULL),
+--     max_year = (SELECT MAX(YEAR(end_date)) FROM tbl_model
+--                 WHERE start_date IS NOT NULL AND end_date IS NOT NULL)
+-- WHERE id = 1;